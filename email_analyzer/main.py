@@ -5,7 +5,11 @@ import threading
 import sys
 import os
 import logging
-from contextlib import contextmanager
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache
+from itertools import islice
 import pythoncom
 
 # Configure basic logging
@@ -14,16 +18,80 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 # Security: Limit the size of email body processed to prevent DoS/Memory exhaustion
 MAX_BODY_LENGTH = 100000
 
+# Once this many emails have been fetched, the rest are analyzed in worker processes.
+# Smaller mailboxes stay on threads, where process start-up and pickling would cost more than they save.
+PROCESS_POOL_THRESHOLD = 1000
+# Number of emails sent to a worker per task
+ANALYSIS_BATCH_SIZE = 32
+# Batches in flight per worker; bounds how many fetched emails are held in memory at once
+MAX_PENDING_BATCHES_PER_WORKER = 4
+# Results are only cached for bodies up to this length. The cache keeps each body as its
+# key, and long bodies are rarely repeated verbatim, so caching them would only pin memory.
+MAX_CACHED_BODY_LENGTH = 4096
+
+# Report sections as (text mark name, title, icon), in display order
+RESULT_SECTIONS = (
+    ("todos", "Outstanding Tasks / To-Dos", "🔴"),
+    ("deadlines", "Upcoming Deadlines", "⏰"),
+    ("mentions", "Name Mentions", "📣"),
+)
+
 # Add src to path
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 try:
     from src.local_email_fetcher import LocalEmailFetcher
-    from src.insight_analyzer import find_todos, find_deadlines, find_name_mentions, split_sentences
+    from src.insight_analyzer import analyze, compile_name_pattern, split_sentences
 except ImportError as e:
     messagebox.showerror("Import Error", f"Failed to import modules: {e}")
     sys.exit(1)
 
+def _analyze_body(body, name_pattern):
+    """Extracts (todos, deadlines, mentions) from an email body."""
+    # Split sentences once
+    sentences = split_sentences(body)
+    results = analyze(sentences, name_pattern)
+    return (
+        tuple(results["todos"]),
+        tuple(results["deadlines"]),
+        tuple(results["mentions"]),
+    )
+
+# Short repeated bodies (reply notifications, newsletters, automated alerts) are only scanned once
+_analyze_cached_body = lru_cache(maxsize=4096)(_analyze_body)
+
+@lru_cache(maxsize=4096)
+def _format_ref(subject):
+    """
+    Formats the subject reference shown under each result.
+    Cached so that every result from a thread sharing a subject reuses one string.
+    """
+    return f"[Subject: {(subject[:75] + '...') if len(subject) > 75 else subject}]"
+
+def _analyze_email(subject, body, name_pattern):
+    """
+    Analyzes a single email for insights.
+
+    Returns a (todos, deadlines, mentions) tuple of found sentences. The subject
+    reference is added by the caller, so workers don't send it back per result.
+    """
+    if len(body) > MAX_BODY_LENGTH:
+        logging.warning("Email '%s...' body too large (%d chars). Truncating to %d.", subject[:30], len(body), MAX_BODY_LENGTH)
+        body = body[:MAX_BODY_LENGTH]
+
+    if len(body) <= MAX_CACHED_BODY_LENGTH:
+        return _analyze_cached_body(body, name_pattern)
+    return _analyze_body(body, name_pattern)
+
+def _analyze_batch(subjects, bodies, name_pattern):
+    """Analyzes a batch of emails, given as parallel subject and body lists."""
+    return [_analyze_email(subject, body, name_pattern) for subject, body in zip(subjects, bodies)]
+
+def _batched(iterable, size):
+    """Yields successive lists of up to size items from iterable."""
+    iterator = iter(iterable)
+    return iter(lambda: list(islice(iterator, size)), [])
+
 class EmailAnalyzerGUI:
     def __init__(self, root):
         self.root = root
@@ -129,6 +197,7 @@ class EmailAnalyzerGUI:
 
         with self._editable_results_text():
             self.results_text.delete(1.0, tk.END)
+        self._begin_results()
 
         # Run in a separate thread to keep UI responsive
         self.analysis_thread = threading.Thread(target=self.run_analysis, args=(user_name,), daemon=True)
@@ -146,7 +215,7 @@ class EmailAnalyzerGUI:
         pythoncom.CoInitialize()  # Critical for pywin32 in threads
         try:
             fetcher = LocalEmailFetcher()
-            emails = fetcher.fetch_emails(
+            emails = fetcher.iter_emails(
                 folder_name=self.folder_var.get(),
                 recursive=self.recursive_var.get(),
                 date_range_days=self.date_range_var.get(),
@@ -154,73 +223,124 @@ class EmailAnalyzerGUI:
                 progress_callback=self.update_progress
             )
 
-            # Analyze
-            todos = []
-            deadlines = []
-            mentions = []
-
-            for email in emails:
-                subject = email.get("subject", "(No Subject)")
-                body = email.get("body", "")
-
-                if len(body) > MAX_BODY_LENGTH:
-                    logging.warning(f"Email '{subject[:30]}...' body too large ({len(body)} chars). Truncating to {MAX_BODY_LENGTH}.")
-                    body = body[:MAX_BODY_LENGTH]
-
-                # Split sentences once
-                sentences = split_sentences(body)
-
-                # Helper for formatting the reference
-                ref = f"[Subject: {(subject[:75] + '...') if len(subject) > 75 else subject}]"
-
-                found_todos = find_todos(sentences)
-                for t in found_todos:
-                    todos.append((t, ref))
-
-                found_deadlines = find_deadlines(sentences)
-                for d in found_deadlines:
-                    deadlines.append((d, ref))
-
-                found_mentions = find_name_mentions(sentences, user_name)
-                for m in found_mentions:
-                    mentions.append((m, ref))
+            # Analyze emails concurrently; each email is independent of the others
+            workers = os.cpu_count() or 1
+
+            # Compile the name regex once for the whole run rather than once per email
+            name_pattern = compile_name_pattern(user_name)
+
+            counts = {key: 0 for key, _, _ in RESULT_SECTIONS}
+
+            def collect(subjects, batch_results):
+                # Show each batch as soon as it is analyzed rather than after the whole run.
+                # Results are paired with their email's subject; the reference text itself
+                # is only formatted when displayed.
+                sections = {key: [] for key in counts}
+                for subject, (found_todos, found_deadlines, found_mentions) in zip(subjects, batch_results):
+                    sections["todos"].extend((t, subject) for t in found_todos)
+                    sections["deadlines"].extend((d, subject) for d in found_deadlines)
+                    sections["mentions"].extend((m, subject) for m in found_mentions)
+                for key, items in sections.items():
+                    counts[key] += len(items)
+                if any(sections.values()):
+                    self.root.after(0, self._append_results, sections)
+
+            email_count = 0
+            pending = deque()
+            max_pending = workers * MAX_PENDING_BATCHES_PER_WORKER
+
+            with ExitStack() as stack:
+                # The mailbox size is only known once fetched, so analysis starts on threads.
+                # Regex matching holds the GIL, so once the mailbox proves large the remaining
+                # batches are spread across processes instead.
+                executor = stack.enter_context(ThreadPoolExecutor(max_workers=workers))
+                process_pool = None
+
+                # Batches are submitted as emails are fetched, so fetching from Outlook
+                # overlaps with the analysis running in the workers. Only the subject and
+                # body columns are sent, which keeps each task (and its pickling cost for
+                # worker processes) small.
+                for batch in _batched(emails, ANALYSIS_BATCH_SIZE):
+                    email_count += len(batch)
+                    if process_pool is None and email_count >= PROCESS_POOL_THRESHOLD:
+                        executor = process_pool = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+                    subjects = [email.get("subject", "(No Subject)") for email in batch]
+                    bodies = [email.get("body", "") for email in batch]
+                    pending.append((subjects, executor.submit(_analyze_batch, subjects, bodies, name_pattern)))
+
+                    # Don't let the fetcher run arbitrarily far ahead of the analysis;
+                    # only a bounded number of emails is kept in memory at a time.
+                    if len(pending) >= max_pending:
+                        subjects, future = pending.popleft()
+                        collect(subjects, future.result())
+
+                while pending:
+                    subjects, future = pending.popleft()
+                    collect(subjects, future.result())
 
             # Update UI
-            self.root.after(0, self.display_results, todos, deadlines, mentions)
+            self.root.after(0, self.display_results, email_count, counts)
 
         except Exception as e:
             logging.exception("An error occurred during analysis")
             self.root.after(0, self.show_error, str(e))
         finally:
+            # Release the cached bodies and results once the run is over
+            _analyze_cached_body.cache_clear()
+            _format_ref.cache_clear()
             pythoncom.CoUninitialize()
 
-    def _display_section(self, title: str, icon: str, items: list):
-        """Helper to display a section of results in the text widget."""
-        self.results_text.insert(tk.END, f"{icon} {title}\n", "subheader")
-        if items:
-            for item, ref in items:
-                self.results_text.insert(tk.END, f"• {item}\n", "bullet")
-                self.results_text.insert(tk.END, f"  {ref}\n\n", "email_ref")
-        else:
-            self.results_text.insert(tk.END, "  No items found.\n\n", "bullet")
-
-    def display_results(self, todos, deadlines, mentions):
+    def _begin_results(self):
+        """
+        Writes the report headers, leaving a text mark at the end of each section
+        so results can be appended to it while the analysis is still running.
+        """
+        with self._editable_results_text():
+            self.results_text.insert(tk.END, "Analysis Results\n\n", "header")
+            for key, title, icon in RESULT_SECTIONS:
+                self.results_text.insert(tk.END, f"{icon} {title}\n", "subheader")
+                # Left gravity keeps the mark in place while the next header is written
+                self.results_text.mark_set(key, "end-1c")
+                self.results_text.mark_gravity(key, tk.LEFT)
+        # Right gravity moves each mark past text inserted at it, keeping results in order
+        for key, _, _ in RESULT_SECTIONS:
+            self.results_text.mark_gravity(key, tk.RIGHT)
+
+    def _display_section(self, key: str, items: list):
+        """Helper to append results to the section of the text widget marked by key."""
+        # Text.insert accepts any number of (text, tags) pairs, so a whole batch of
+        # results is inserted with a single Tk call instead of one call per line.
+        chunks = []
+        for item, subject in items:
+            chunks += (f"• {item}\n", "bullet", f"  {_format_ref(subject)}\n\n", "email_ref")
+        self.results_text.insert(key, *chunks)
+
+    def _append_results(self, sections):
+        """Appends a batch of results, given as lists keyed by section."""
+        with self._editable_results_text():
+            for key, items in sections.items():
+                if items:
+                    self._display_section(key, items)
+
+    def display_results(self, email_count, counts):
         self.progress.stop()
         self.progress.pack_forget()
 
         with self._editable_results_text():
-            self.results_text.insert(tk.END, "Analysis Results\n\n", "header")
-
-            self._display_section("Outstanding Tasks / To-Dos", "🔴", todos)
-            self._display_section("Upcoming Deadlines", "⏰", deadlines)
-            self._display_section("Name Mentions", "📣", mentions)
+            for key, _, _ in RESULT_SECTIONS:
+                if not counts[key]:
+                    self.results_text.insert(key, "  No items found.\n\n", "bullet")
 
-        self.status_lbl.config(text=f"Analysis Complete. Found {len(todos)} tasks, {len(deadlines)} deadlines, {len(mentions)} mentions.")
+        self.status_lbl.config(text=f"Analysis Complete. Analyzed {email_count} emails. Found {counts['todos']} tasks, {counts['deadlines']} deadlines, {counts['mentions']} mentions.")
         self.analyze_btn.config(state="normal")
 
     def show_error(self, message):
         self.progress.stop()
         self.progress.pack_forget()
+        # The report headers were written when the run started; don't leave them
+        # (or a partial report) behind for a run that failed
+        with self._editable_results_text():
+            self.results_text.delete(1.0, tk.END)
         messagebox.showerror("Error", message)
         self.status_lbl.config(text="Error occurred.")
         self.analyze_btn.config(state="normal")
@@ -3,14 +3,17 @@ This module provides functions to analyze email content and extract
 actionable insights such as to-do items, deadlines, and name mentions.
 """
 import re
-from typing import List, Union
+import weakref
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple, Union
 from functools import lru_cache
 
 # Compile regex at module level to avoid recompilation and reuse across functions
 # Split email into sentences. A more robust sentence tokenizer could be used for complex cases.
 # This basic split works for many common email formats.
+# The cheap punctuation lookbehind comes first so the abbreviation lookbehinds
+# only run at actual sentence-ending positions, not at every character.
 SENTENCE_SPLIT_REGEX = re.compile(
-    r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<!Mr\.)(?<!Ms\.)(?<!Dr\.)(?<=\.|\?|\!)\s'
+    r'(?<=[.?!])(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<!Mr\.)(?<!Ms\.)(?<!Dr\.)\s'
 )
 
 # Compiled regex for find_todos
@@ -29,6 +32,9 @@ todo_pattern = (
     r'\b(?:' + '|'.join(map(re.escape, alphanumeric_todos)) + r')\b|' +
     r'\b(?:' + '|'.join(map(re.escape, symbol_todos)) + r')(?=\s|$)'
 )
+# The keywords are ASCII, but re.ASCII must not be used here: it would also make \b
+# and \d ASCII-only, so keywords would match next to accented letters (e.g. "Pokécan you")
+# and non-ASCII digits would no longer count (e.g. "within ٣ days").
 TODO_REGEX = re.compile(todo_pattern, re.IGNORECASE)
 
 # Compiled regex for find_deadlines
@@ -52,10 +58,24 @@ DEADLINE_DATE_PATTERNS = [
     r"\bby\s+\d{4}-\d{2}-\d{2}\b",          # by 2023-12-25
     r"\b(?:on|before)\s+\w+\s+\d{1,2}(?:st|nd|rd|th)?\b" # on March 15th
 ]
+# Factor the shared "by " prefix out of the keyword alternation so the regex engine
+# tests it once per position instead of once per "by ..." keyword.
+by_deadline_keywords = [k[len("by "):] for k in DEADLINE_KEYWORDS_REGEX if k.startswith("by ")]
+other_deadline_keywords = [k for k in DEADLINE_KEYWORDS_REGEX if not k.startswith("by ")]
 # Combine keyword and date patterns into a single regex for efficiency
-deadline_keyword_pattern = r'\b(?:' + '|'.join(DEADLINE_KEYWORDS_REGEX) + r')\b'
+deadline_keyword_pattern = (
+    r'\b(?:by (?:' + '|'.join(by_deadline_keywords) + r')|' +
+    '|'.join(other_deadline_keywords) + r')\b'
+)
 deadline_date_pattern = '|'.join(DEADLINE_DATE_PATTERNS)
-DEADLINE_REGEX = re.compile(f'{deadline_keyword_pattern}|{deadline_date_pattern}', re.IGNORECASE)
+deadline_pattern = f'{deadline_keyword_pattern}|{deadline_date_pattern}'
+DEADLINE_REGEX = re.compile(deadline_pattern, re.IGNORECASE)
+
+# Union of the to-do and deadline patterns, used by analyze() to reject
+# sentences without any insight in a single scan instead of one per category.
+# Each alternative is a named group, so m.lastgroup tells which category matched.
+insight_pattern = f'(?P<todos>{todo_pattern})|(?P<deadlines>{deadline_pattern})'
+INSIGHT_REGEX = re.compile(insight_pattern, re.IGNORECASE)
 
 
 def split_sentences(text: str) -> List[str]:
@@ -92,12 +112,14 @@ def find_todos(email_body: Union[str, List[str]]) -> List[str]:
 
     found_todos: List[str] = []
     sentences = _ensure_sentences(email_body)
+    # Bind the compiled regex's search once rather than looking it up per sentence
+    todo_search = TODO_REGEX.search
 
     for sentence in sentences:
         # Optimization: removed redundant 'if not sentence.strip(): continue'
         # The regex search will naturally fail on whitespace/empty strings.
         # Use compiled regex for performance
-        if TODO_REGEX.search(sentence):
+        if todo_search(sentence):
             found_todos.append(sentence.strip())
 
     return found_todos
@@ -118,57 +140,241 @@ def find_deadlines(email_body: Union[str, List[str]]) -> List[str]:
 
     found_deadlines: List[str] = []
     sentences = _ensure_sentences(email_body)
+    deadline_search = DEADLINE_REGEX.search
 
     for sentence in sentences:
         # Optimization: removed redundant 'if not sentence.strip(): continue'
-
-        # Check compiled keyword regex
-        if DEADLINE_REGEX.search(sentence):
+        # DEADLINE_REGEX covers both the keywords and the date patterns in one scan
+        if deadline_search(sentence):
             found_deadlines.append(sentence.strip())
-            continue
 
-        # Removed unreachable code block for undefined DEADLINE_DATE_REGEX
-    
     return found_deadlines
 
+# Name regexes built by compile_name_pattern from plain names. Only these are known to be
+# safe to embed in a larger pattern; a caller's own compiled pattern may use global inline
+# flags, numbered backreferences or group names that would break the combined regex.
+_BUILT_NAME_REGEXES = weakref.WeakSet()
+
+def _built_name_regex(regex: Pattern) -> Pattern:
+    """Records regex as built from plain names and returns it."""
+    _BUILT_NAME_REGEXES.add(regex)
+    return regex
+
 @lru_cache(maxsize=128)
 def _get_name_mention_regex(user_name: str):
     """
     Returns a compiled regex for finding mentions of a user name.
     Cached to avoid recompilation and string concatenation overhead.
     """
-    return re.compile(rf'\b{re.escape(user_name)}\b', re.IGNORECASE)
+    return _built_name_regex(re.compile(rf'\b{re.escape(user_name)}\b', re.IGNORECASE))
+
+@lru_cache(maxsize=128)
+def _get_names_mention_regex(user_names: Tuple[str, ...]):
+    """
+    Returns one compiled regex matching a mention of any of user_names.
+    """
+    alternatives = '|'.join(map(re.escape, user_names))
+    return _built_name_regex(re.compile(rf'\b(?:{alternatives})\b', re.IGNORECASE))
+
+def compile_name_pattern(user_name: Union[str, Iterable[str], Pattern]) -> Optional[Pattern]:
+    """
+    Returns the compiled regex for finding mentions of user_name.
+
+    Callers analyzing many emails for the same name can compile it once with this
+    function and pass the result to find_name_mentions/analyze in place of the name.
+    An iterable of names compiles to a single pattern matching any of them, so a
+    whole team's names are found in one scan. Already compiled patterns are returned
+    unchanged; None is returned when there is no non-empty name.
+    """
+    if isinstance(user_name, re.Pattern):
+        return user_name
+    if not user_name:
+        return None
+    if isinstance(user_name, str):
+        user_name = (user_name,)
+    # Strip names to prevent regex issues (e.g., boundaries around whitespace)
+    names = tuple(dict.fromkeys(n.strip() for n in user_name if n and n.strip()))
+    if not names:
+        return None
+    if len(names) == 1:
+        return _get_name_mention_regex(names[0])
+    return _get_names_mention_regex(names)
+
+# Characters whose case folding does not line up with re.IGNORECASE matching
+# (dotless i, and the combining dot produced by folding a dotted capital I).
+_UNRELIABLE_FOLD_CHARS = ("\u0131", "\u0307")
 
-def find_name_mentions(email_body: Union[str, List[str]], user_name: str) -> List[str]:
+@lru_cache(maxsize=128)
+def _get_name_literal(name_pattern: str) -> Optional[str]:
+    """
+    Returns the casefolded name behind a pattern built by compile_name_pattern,
+    or None if the pattern is not a plain name and cannot be pre-checked.
+    """
+    if not (name_pattern.startswith(r'\b') and name_pattern.endswith(r'\b')):
+        return None
+    escaped = name_pattern[2:-2]
+    name = re.sub(r'\\(.)', r'\1', escaped, flags=re.DOTALL)
+    if re.escape(name) != escaped:
+        return None
+    folded = name.casefold()
+    if any(c in folded for c in _UNRELIABLE_FOLD_CHARS):
+        return None
+    return folded
+
+def _fold_body(email_body: Union[str, List[str]]) -> str:
+    """
+    Returns the casefolded text of an email body or list of sentences, for _may_mention.
+    """
+    text = email_body if isinstance(email_body, str) else " ".join(email_body)
+    return text.casefold()
+
+def _may_mention(folded_body: str, name_regex: Pattern) -> bool:
+    """
+    Cheap substring pre-check for name mentions.
+    Most emails never mention the user, and a C-level substring test on the casefolded
+    text (from _fold_body) is far cheaper than running the regex over every sentence.
+    It never rejects text that name_regex would match.
+    """
+    name = _get_name_literal(name_regex.pattern)
+    if name is None:
+        return True
+    return name in folded_body or any(c in folded_body for c in _UNRELIABLE_FOLD_CHARS)
+
+def find_name_mentions(email_body: Union[str, List[str]], user_name: Union[str, Iterable[str], Pattern]) -> List[str]:
     """
     Finds sentences where a specific user_name is mentioned.
 
     Args:
         email_body: The text content of the email or a list of sentences.
-        user_name: The name to search for (case-insensitive).
+        user_name: The name to search for (case-insensitive), several names to
+            search for at once, or a pattern returned by compile_name_pattern.
 
     Returns:
         A list of sentences or lines where the user_name is mentioned.
         Returns an empty list if the name is not found or inputs are invalid.
     """
-    if not email_body or not user_name or not user_name.strip():
+    if not email_body:
         return []
 
-    found_mentions: List[str] = []
-
     # Use cached compiled regex
-    # Strip user_name to prevent regex issues (e.g., boundaries around whitespace)
-    regex = _get_name_mention_regex(user_name.strip())
-    
+    regex = compile_name_pattern(user_name)
+    if regex is None or not _may_mention(_fold_body(email_body), regex):
+        return []
+
+    found_mentions: List[str] = []
     sentences = _ensure_sentences(email_body)
+    name_search = regex.search
 
     for sentence in sentences:
         # Optimization: removed redundant 'if not sentence.strip(): continue'
-        if regex.search(sentence):
+        if name_search(sentence):
             found_mentions.append(sentence.strip())
             
     return found_mentions
 
+def find_all_name_mentions(email_body: Union[str, List[str]], user_names: Iterable[str]) -> Dict[str, List[str]]:
+    """
+    Finds the sentences mentioning each of several names.
+
+    Equivalent to calling find_name_mentions once per name, but names absent from the
+    text are discarded by the substring pre-check up front, and the remaining names
+    share one combined scan, so sentences mentioning none of them are rejected once
+    rather than once per name.
+
+    Args:
+        email_body: The text content of the email or a list of sentences.
+        user_names: The names to search for (case-insensitive).
+
+    Returns:
+        A dict mapping each (stripped, non-empty) name to the sentences mentioning it.
+    """
+    names = list(dict.fromkeys(n.strip() for n in user_names if n and n.strip()))
+    results: Dict[str, List[str]] = {name: [] for name in names}
+    if not email_body or not names:
+        return results
+
+    folded_body = _fold_body(email_body)
+    regexes = {name: _get_name_mention_regex(name) for name in names}
+    candidates = [name for name in names if _may_mention(folded_body, regexes[name])]
+    if not candidates:
+        return results
+    any_name_search = compile_name_pattern(candidates).search
+
+    for sentence in _ensure_sentences(email_body):
+        if not any_name_search(sentence):
+            continue
+        stripped = sentence.strip()
+        for name in candidates:
+            if regexes[name].search(sentence):
+                results[name].append(stripped)
+
+    return results
+
+@lru_cache(maxsize=128)
+def _get_insight_regex(name_pattern: str):
+    """
+    Returns INSIGHT_REGEX extended with the given name mention pattern, which must
+    have been built by compile_name_pattern. Cached to avoid recompiling the combined
+    pattern for every email.
+    """
+    return re.compile(f'{insight_pattern}|(?P<mentions>{name_pattern})', re.IGNORECASE)
+
+def analyze(email_body: Union[str, List[str]], user_name: Union[str, Iterable[str], Pattern] = None) -> Dict[str, List[str]]:
+    """
+    Finds to-do items, deadlines and name mentions in a single pass over the sentences.
+
+    Equivalent to calling find_todos, find_deadlines and find_name_mentions, but
+    sentences that match none of them are rejected with one combined regex scan.
+
+    Args:
+        email_body: The text content of the email or a list of sentences.
+        user_name: Optional name (or names) to search for (case-insensitive), or a
+            pattern returned by compile_name_pattern.
+
+    Returns:
+        A dict with "todos", "deadlines" and "mentions" lists of sentences.
+    """
+    results: Dict[str, List[str]] = {"todos": [], "deadlines": [], "mentions": []}
+    if not email_body:
+        return results
+
+    name_regex = compile_name_pattern(user_name)
+    if name_regex is not None and not _may_mention(_fold_body(email_body), name_regex):
+        name_regex = None
+    # A caller's own pattern can't be embedded in the combined regex, so it gets
+    # a separate scan of the sentences the combined regex rejects
+    name_search = None
+    if name_regex is None:
+        insight_regex = INSIGHT_REGEX
+    elif name_regex in _BUILT_NAME_REGEXES:
+        insight_regex = _get_insight_regex(name_regex.pattern)
+    else:
+        insight_regex = INSIGHT_REGEX
+        name_search = name_regex.search
+    # Bound once; the miss path below runs for nearly every sentence
+    insight_search = insight_regex.search
+
+    for sentence in _ensure_sentences(email_body):
+        # Most sentences contain no insight at all; discard them with one scan
+        match = insight_search(sentence)
+        if not match:
+            if name_search is not None and name_search(sentence):
+                results["mentions"].append(sentence.strip())
+            continue
+
+        # The category that matched is known without rescanning; only the others
+        # (which may overlap or come later in the sentence) need their own search.
+        matched = match.lastgroup
+        stripped = sentence.strip()
+        if matched == "todos" or TODO_REGEX.search(sentence):
+            results["todos"].append(stripped)
+        if matched == "deadlines" or DEADLINE_REGEX.search(sentence):
+            results["deadlines"].append(stripped)
+        if name_regex and (matched == "mentions" or name_regex.search(sentence)):
+            results["mentions"].append(stripped)
+
+    return results
+
 
 if __name__ == "__main__":
     sample_email_body = """
@@ -1,6 +1,13 @@
 import datetime
+import queue
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+import pythoncom
 import win32com.client
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Iterator
 
 import logging
 
@@ -11,17 +18,54 @@ OL_FOLDER_SENT_MAIL = 5
 OL_FOLDER_INBOX = 6
 OL_MAIL_ITEM = 43
 
+# DASL name of PR_MESSAGE_CLASS; mail items have classes starting with IPM.Note
+PR_MESSAGE_CLASS = "http://schemas.microsoft.com/mapi/proptag/0x001A001F"
+
+# Worker threads used to read subfolders concurrently when fetching recursively
+MAX_FOLDER_WORKERS = 4
+
+def _connect_outlook():
+    """
+    Returns the running Outlook application, starting it if necessary.
+
+    Early binding through the makepy cache lets property reads call by DISPID instead
+    of looking each name up first; the wrappers are generated once, on first use.
+    """
+    try:
+        return win32com.client.gencache.EnsureDispatch("Outlook.Application")
+    except Exception as e:
+        # e.g. a read-only or corrupt gen_py cache; late binding still works
+        logger.warning("Early-bound Outlook access unavailable, using late binding: %s", e)
+    try:
+        return win32com.client.GetActiveObject("Outlook.Application")
+    except Exception:
+        return win32com.client.Dispatch("Outlook.Application")
+
+def _iter_items(items):
+    """
+    Walks an Outlook Items collection with GetFirst/GetNext, which follow the
+    collection's Restrict/Sort state natively instead of going through a COM enumerator.
+    """
+    item = items.GetFirst()
+    while item is not None:
+        yield item
+        item = items.GetNext()
+
+def _iter_folders(folders):
+    """
+    Walks an Outlook Folders collection by index, querying Count only once, instead
+    of creating a COM enumerator.
+    """
+    for index in range(1, folders.Count + 1):
+        yield folders.Item(index)
+
 class LocalEmailFetcher:
     def __init__(self):
         try:
-            try:
-                self.outlook = win32com.client.GetActiveObject("Outlook.Application")
-            except Exception:
-                self.outlook = win32com.client.Dispatch("Outlook.Application")
-
+            self.outlook = _connect_outlook()
             self.namespace = self.outlook.GetNamespace("MAPI")
         except Exception as e:
-            logger.error(f"Failed to connect to Outlook: {e}")
+            logger.error("Failed to connect to Outlook: %s", e)
             raise ConnectionError(f"Failed to connect to Outlook: {e}. Is Outlook running?")
 
     def fetch_emails(self,
@@ -43,6 +87,26 @@ class LocalEmailFetcher:
         Returns:
             A list of dictionaries containing email details.
         """
+        return list(self.iter_emails(folder_name, recursive, date_range_days, subject_filter, progress_callback))
+
+    def iter_emails(self,
+                    folder_name: str = "Inbox",
+                    recursive: bool = False,
+                    date_range_days: int = 0,
+                    subject_filter: str = None,
+                    progress_callback: Optional[Callable[[int], None]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yields emails from the specified folder as they are read from Outlook,
+        so callers can start processing before the whole folder has been fetched.
+
+        Takes the same arguments as fetch_emails. Must be consumed on the thread that
+        created this fetcher, since the underlying COM objects are apartment-bound.
+        With recursive, subfolders are read whole on worker threads, so up to
+        MAX_FOLDER_WORKERS folders' emails are held in memory (see _process_subfolders).
+
+        Yields:
+            Dictionaries containing email details.
+        """
 
         # Resolve the folder
         folder = None
@@ -65,23 +129,27 @@ class LocalEmailFetcher:
             raise # Re-raise known errors
         except Exception as e:
             # Wrap COM errors
-            logger.exception(f"Error accessing folder {folder_name}")
+            logger.exception("Error accessing folder %s", folder_name)
             raise ValueError(f"Error accessing folder '{folder_name}': {e}")
 
         # Calculate date range
         cutoff_date = datetime.datetime.now() - datetime.timedelta(days=date_range_days)
         cutoff_date = cutoff_date.replace(hour=0, minute=0, second=0, microsecond=0)
 
-        emails = []
         processed_count = [0]
+        progress_lock = threading.Lock()
 
         def _on_progress():
-            processed_count[0] += 1
-            if progress_callback and processed_count[0] % 10 == 0:
-                progress_callback(processed_count[0])
-
-        self._process_folder(folder, recursive, cutoff_date, emails, subject_filter, _on_progress)
-        return emails
+            # Called from the subfolder worker threads as well
+            with progress_lock:
+                processed_count[0] += 1
+                count = processed_count[0]
+            if progress_callback and count % 10 == 0:
+                progress_callback(count)
+
+        yield from self._process_folder(folder, cutoff_date, subject_filter, _on_progress)
+        if recursive:
+            yield from self._process_subfolders(folder, cutoff_date, subject_filter, _on_progress)
 
     def _find_folder(self, parent_folder, folder_name):
         """
@@ -99,12 +167,19 @@ class LocalEmailFetcher:
 
             found_sub = None
             try:
-                for folder in current_parent.Folders:
-                    if folder.Name.lower() == part.lower():
-                        found_sub = folder
-                        break
+                folders = current_parent.Folders
+                try:
+                    # A name-keyed lookup resolves the folder in a single COM call
+                    found_sub = folders.Item(part)
+                except Exception:
+                    # No exact match; fall back to a case-insensitive scan
+                    part_lower = part.lower()
+                    for folder in _iter_folders(folders):
+                        if folder.Name.lower() == part_lower:
+                            found_sub = folder
+                            break
             except Exception as e:
-                 logger.warning(f"Error while searching for folder '{part}' in '{getattr(current_parent, 'Name', 'Unknown')}': {e}")
+                 logger.warning("Error while searching for folder '%s' in '%s': %s", part, getattr(current_parent, 'Name', 'Unknown'), e)
                  return None
 
             if found_sub:
@@ -115,75 +190,200 @@ class LocalEmailFetcher:
 
         return target_folder
 
-    def _process_folder(self, folder, recursive, cutoff_date, emails_list, subject_filter=None, on_progress=None):
+    def _collect_subfolder_ids(self, folder):
+        """
+        Returns (EntryID, StoreID) pairs for every folder below folder, depth-first.
+        """
+        folder_ids = []
+        try:
+            folders = folder.Folders
+            count = folders.Count
+        except Exception as e:
+             logger.warning("Error accessing subfolders of '%s': %s", folder.Name, e)
+             return folder_ids
+
+        # Index each child separately so one unreadable subfolder doesn't hide its siblings
+        for index in range(1, count + 1):
+            try:
+                subfolder = folders.Item(index)
+                folder_ids.append((subfolder.EntryID, subfolder.StoreID))
+            except Exception as e:
+                logger.warning("Error accessing subfolder %d of '%s': %s", index, folder.Name, e)
+                continue
+            folder_ids.extend(self._collect_subfolder_ids(subfolder))
+        return folder_ids
+
+    def _process_subfolders(self, folder, cutoff_date, subject_filter=None, on_progress=None):
+        """
+        Yields emails from every folder below folder, reading the folders concurrently.
+        Results are yielded in the same depth-first order as a sequential walk.
+
+        Each worker reads a whole folder into a list before it is yielded, so memory is
+        bounded by MAX_FOLDER_WORKERS folders in flight, not by a fixed number of emails;
+        a single very large subfolder is held in full.
+        """
+        folder_ids = self._collect_subfolder_ids(folder)
+        if not folder_ids:
+            return
+
+        workers = min(MAX_FOLDER_WORKERS, len(folder_ids))
+        remaining = iter(folder_ids)
+        jobs = queue.Queue()
+
+        def _submit(ids):
+            # Each folder gets its own result slot, so results can be taken in order
+            result = queue.Queue(maxsize=1)
+            jobs.put((ids, result))
+            return result
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for _ in range(workers):
+                executor.submit(self._run_folder_worker, jobs, cutoff_date, subject_filter, on_progress)
+            # Only one folder per worker is read ahead, and each finished folder is replaced
+            # by the next, so a slow consumer doesn't hold every folder's emails in memory
+            pending = deque(_submit(ids) for ids in islice(remaining, workers))
+            try:
+                while pending:
+                    emails = pending.popleft().get()
+                    next_ids = next(remaining, None)
+                    if next_ids is not None:
+                        pending.append(_submit(next_ids))
+                    yield from emails
+            finally:
+                # If the caller stops early, don't read folders nobody will see
+                while True:
+                    try:
+                        jobs.get_nowait()
+                    except queue.Empty:
+                        break
+                # One stop signal per worker; each finishes its current folder first
+                for _ in range(workers):
+                    jobs.put(None)
+
+    def _run_folder_worker(self, jobs, cutoff_date, subject_filter=None, on_progress=None):
+        """
+        Reads folders on a worker thread until it takes None from jobs, putting each
+        folder's emails, as a list, on that job's result queue.
+        COM objects cannot be shared across threads, so the worker joins its own
+        apartment and connects to Outlook once, reusing the connection for every folder.
+        """
+        pythoncom.CoInitialize()
+        namespace = None
+        try:
+            try:
+                namespace = _connect_outlook().GetNamespace("MAPI")
+            except Exception as e:
+                logger.error("Failed to connect to Outlook from worker thread: %s", e)
+            for (entry_id, store_id), result in iter(jobs.get, None):
+                emails = []
+                if namespace is not None:
+                    emails = self._read_folder_by_id(namespace, entry_id, store_id, cutoff_date, subject_filter, on_progress)
+                result.put(emails)
+        finally:
+            # Release the connection before leaving the apartment
+            namespace = None
+            pythoncom.CoUninitialize()
+
+    def _read_folder_by_id(self, namespace, entry_id, store_id, cutoff_date, subject_filter=None, on_progress=None):
+        """Re-opens a folder from its IDs and returns its emails as a list."""
+        try:
+            folder = namespace.GetFolderFromID(entry_id, store_id)
+            return list(self._process_folder(folder, cutoff_date, subject_filter, on_progress))
+        except Exception as e:
+            logger.warning("Error accessing subfolder (EntryID: %s...): %s", str(entry_id)[:20], e)
+            return []
+
+    def _process_folder(self, folder, cutoff_date, subject_filter=None, on_progress=None):
         items = folder.Items
         sorted_success = False
+        restricted = False
 
-        # Attempt to Restrict by date first for performance
+        # Attempt to Restrict by date and message class first for performance
         try:
-            cutoff_str = cutoff_date.strftime('%m/%d/%Y %I:%M %p')
-            # Using simple format, hoping system locale accepts it or OLE handles it.
+            # A DASL query takes an ISO date regardless of the system locale, but compares
+            # in UTC, so convert the local cutoff first. Non-mail items (meeting requests,
+            # reports) are dropped by message class in the same query.
             # If it fails, we fall back to manual filtering.
-            filtered_items = items.Restrict(f"[ReceivedTime] >= '{cutoff_str}'")
+            cutoff_str = cutoff_date.astimezone(datetime.timezone.utc).strftime('%Y-%m-%d %H:%M')
+            filtered_items = items.Restrict(
+                f"@SQL=\"urn:schemas:httpmail:datereceived\" >= '{cutoff_str}'"
+                f" AND \"{PR_MESSAGE_CLASS}\" LIKE 'IPM.Note%'"
+            )
             items = filtered_items
+            restricted = True
         except Exception as e:
-            logger.warning(f"Could not Restrict items in folder '{folder.Name}'. Falling back to manual filtering. Error: {e}")
+            logger.warning("Could not Restrict items in folder '%s'. Falling back to manual filtering. Error: %s", folder.Name, e)
             # items remains folder.Items (all items)
 
         try:
             items.Sort("[ReceivedTime]", True) # Descending
             sorted_success = True
         except Exception as e:
-            logger.warning(f"Could not sort items in folder '{folder.Name}'. Performance may be affected. Error: {e}")
+            logger.warning("Could not sort items in folder '%s'. Performance may be affected. Error: %s", folder.Name, e)
+
+        # The cutoff in local time, for comparing with timezone-aware received times
+        local_cutoff_date = cutoff_date.astimezone()
 
-        for item in items:
+        # Lower-case the filter once rather than once per item.
+        subject_filter = subject_filter.lower() if subject_filter else None
+
+        for item in _iter_items(items):
             try:
-                # Check if it's a MailItem
-                if item.Class != OL_MAIL_ITEM:
+                # Check if it's a MailItem, unless Restrict already filtered by message class
+                if not restricted and item.Class != OL_MAIL_ITEM:
                     continue
 
                 # Check date
                 received_time = item.ReceivedTime
 
+                # Restrict already dropped older items; only check when it could not be applied.
+                # Aware times are compared as they are, so skipped items are never converted.
+                if not restricted:
+                    cutoff = cutoff_date if received_time.tzinfo is None else local_cutoff_date
+                    if received_time < cutoff:
+                        if sorted_success:
+                            # Since we sorted descending, and found an old email, we can stop processing this folder.
+                            break
+                        else:
+                            continue
+
                 if received_time.tzinfo is not None:
                     received_time = received_time.astimezone(None).replace(tzinfo=None)
 
-                if received_time < cutoff_date:
-                    if sorted_success:
-                        # Since we sorted descending, and found an old email, we can stop processing this folder.
-                        break
-                    else:
-                        continue
+                # Each property access is a COM round-trip, so read Subject only once
+                subject = item.Subject
 
                 # Subject filter check
-                if subject_filter and subject_filter.lower() not in item.Subject.lower():
+                if subject_filter and subject_filter not in subject.lower():
                     continue
 
+                # The same few senders recur across an inbox; share one string per name
+                sender = item.SenderName
+                if sender:
+                    sender = sys.intern(sender)
+
                 email_data = {
-                    "subject": item.Subject,
+                    "subject": subject,
                     "body": item.Body,
-                    "sender": item.SenderName,
+                    "sender": sender,
                     "received_time": str(received_time)
                 }
-                emails_list.append(email_data)
-
                 if on_progress:
                     on_progress()
 
+                yield email_data
+
             except Exception as e:
                 # Skip individual items that cause errors
+                if not logger.isEnabledFor(logging.ERROR):
+                    # Don't pay a COM round-trip for an identifier nobody will see
+                    continue
+
                 # Security: Avoid logging the full subject as it may contain sensitive information.
                 try:
                     item_identifier = f"EntryID: {str(item.EntryID)[:20]}..."
                 except Exception:
                     item_identifier = "Unknown ID"
 
-                logger.error(f"Error processing item ({item_identifier}): {e}")
+                logger.error("Error processing item (%s): %s", item_identifier, e)
                 continue
-
-        if recursive:
-            try:
-                for subfolder in folder.Folders:
-                    self._process_folder(subfolder, True, cutoff_date, emails_list, subject_filter, on_progress)
-            except Exception as e:
-                 logger.warning(f"Error accessing subfolders of '{folder.Name}': {e}")
@@ -0,0 +1,14 @@
+"""
+Shared test setup: modules that are unavailable or unusable in a test run are
+replaced with mocks once, before any test module imports the code under test.
+"""
+import sys
+from unittest.mock import MagicMock
+
+# The GUI is never shown in tests, so tkinter is always mocked
+for module_name in ("tkinter", "tkinter.ttk", "tkinter.messagebox", "tkinter.scrolledtext"):
+    sys.modules[module_name] = MagicMock()
+
+# pywin32 only exists on Windows; a real install is kept where there is one
+for module_name in ("win32com", "win32com.client", "pythoncom"):
+    sys.modules.setdefault(module_name, MagicMock())
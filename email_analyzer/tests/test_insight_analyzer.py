@@ -1,5 +1,6 @@
 import pytest
-from src.insight_analyzer import find_todos, find_deadlines, find_name_mentions
+import re
+from src.insight_analyzer import find_todos, find_deadlines, find_name_mentions, analyze
 
 def test_find_todos():
     sample_text = """
@@ -78,3 +79,44 @@ def test_todo_edge_cases():
     # But "action item" works because it ends with 'm' (word char).
     text_pass = "This is an action item."
     assert len(find_todos(text_pass)) == 1
+
+def test_analyze_matches_find_functions():
+    sample_text = """
+    First, can you please complete the report by EOD Friday?
+    John, I need you to look into the server logs.
+    The deadline is next Wednesday for the phase 1 rollout.
+    Nothing to see in this sentence.
+    Alice, please follow up on the client query.
+    """
+    results = analyze(sample_text, "John")
+    assert results["todos"] == find_todos(sample_text)
+    assert results["deadlines"] == find_deadlines(sample_text)
+    assert results["mentions"] == find_name_mentions(sample_text, "John")
+
+def test_analyze_keeps_compiled_pattern_flags():
+    # A caller's case-sensitive pattern must not pick up the keyword regexes' IGNORECASE
+    sample_text = "john left early. John, the logs are ready."
+    name_regex = re.compile(r"\bJohn\b")
+    results = analyze(sample_text, name_regex)
+    assert results["mentions"] == find_name_mentions(sample_text, name_regex)
+    assert results["mentions"] == ["John, the logs are ready."]
+
+@pytest.mark.parametrize("name_regex", [
+    re.compile(r"(?i)\bjohn\b"),
+    re.compile(r"\b(J)ohn and \1ane\b"),
+    re.compile(r"\b(?P<todos>John)\b"),
+])
+def test_analyze_with_caller_pattern(name_regex):
+    # Patterns that can't be nested in the combined regex are searched on their own
+    sample_text = "John and Jane, can you check this? John is away. Nothing else here."
+    results = analyze(sample_text, name_regex)
+    assert results["mentions"] == find_name_mentions(sample_text, name_regex)
+    assert results["mentions"]
+    assert results["todos"] == find_todos(sample_text)
+
+def test_analyze_without_user_name():
+    results = analyze("John, can you check this by tomorrow?", "  ")
+    assert len(results["todos"]) == 1
+    assert len(results["deadlines"]) == 1
+    assert results["mentions"] == []
+    assert analyze("") == {"todos": [], "deadlines": [], "mentions": []}
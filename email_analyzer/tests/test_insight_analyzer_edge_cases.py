@@ -1,6 +1,6 @@
 
 import pytest
-from src.insight_analyzer import find_name_mentions
+from src.insight_analyzer import find_name_mentions, find_all_name_mentions, compile_name_pattern
 
 def test_find_name_mentions_whitespace():
     sample_text = "Hello John, how are you?"
@@ -19,3 +19,43 @@ def test_find_name_mentions_whitespace():
     # Test with just whitespace
     mentions_empty = find_name_mentions(sample_text, "   ")
     assert len(mentions_empty) == 0
+
+def test_find_name_mentions_precompiled_pattern():
+    sample_text = "Hello John, how are you? Johnny is here too."
+
+    pattern = compile_name_pattern(" John ")
+    assert compile_name_pattern(pattern) is pattern
+    assert compile_name_pattern("   ") is None
+
+    mentions = find_name_mentions(sample_text, pattern)
+    assert mentions == find_name_mentions(sample_text, "John")
+    assert mentions == ["Hello John, how are you?"]
+
+@pytest.mark.parametrize("text, user_name", [
+    ("Thanks JOHN for the update.", "john"),
+    ("Merci José, à demain.", "JOSÉ"),
+    ("İlker will join the call.", "ilker"),
+    ("Please ask Krista about it.", "krista"),  # Kelvin sign matches 'k' case-insensitively
+])
+def test_find_name_mentions_case_insensitive_prefilter(text, user_name):
+    """The substring pre-check must never hide a mention the regex would find."""
+    assert find_name_mentions(text, user_name) == [text]
+
+def test_find_name_mentions_multiple_names():
+    sample_text = "Alice will send the notes. Bob can review them. Johnny is out today."
+
+    mentions = find_name_mentions(sample_text, ["Alice", " bob ", "John", "", "Alice"])
+    assert mentions == ["Alice will send the notes.", "Bob can review them."]
+    assert compile_name_pattern(["Alice", "Bob"]) is compile_name_pattern(("Alice", "Bob"))
+    assert compile_name_pattern(["", "  "]) is None
+
+def test_find_all_name_mentions_matches_per_name_calls():
+    sample_text = "John Smith sent the notes. Ask alice about them. Johnny is out today. Bob? Not today."
+    names = ["John", "John Smith", " Alice ", "Carol", "", "John"]
+
+    results = find_all_name_mentions(sample_text, names)
+    assert list(results) == ["John", "John Smith", "Alice", "Carol"]
+    for name, mentions in results.items():
+        assert mentions == find_name_mentions(sample_text, name)
+    assert results["John"] == ["John Smith sent the notes."]
+    assert find_all_name_mentions("", ["John"]) == {"John": []}
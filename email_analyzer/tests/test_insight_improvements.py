@@ -1,5 +1,5 @@
 import pytest
-from src.insight_analyzer import find_todos, split_sentences, find_deadlines
+from src.insight_analyzer import analyze, find_todos, split_sentences, find_deadlines
 
 @pytest.mark.parametrize("text, expected_todo", [
     ("Task: investigate the issue.", "Task: investigate the issue."),
@@ -47,3 +47,37 @@ def test_expanded_deadline_keywords(text_with_deadline):
     # Fix #6: New keywords
     deadlines = find_deadlines(text_with_deadline)
     assert deadlines, f"Failed to find deadline in: '{text_with_deadline}'"
+
+@pytest.mark.parametrize("text", [
+    "Pokécan you help",
+    "Action itemé",
+])
+def test_todo_keywords_need_unicode_word_boundaries(text):
+    """
+    Test that a keyword running into an accented letter is not a to-do.
+    """
+    assert find_todos(text) == []
+    assert analyze(text)["todos"] == []
+
+@pytest.mark.parametrize("text", [
+    "Ñasap",
+    "bis EODé",
+    "by end of dayß",
+])
+def test_deadline_keywords_need_unicode_word_boundaries(text):
+    """
+    Test that a keyword running into an accented letter is not a deadline.
+    """
+    assert find_deadlines(text) == []
+    assert analyze(text)["deadlines"] == []
+
+@pytest.mark.parametrize("text", [
+    "Reply within ٣ days.",
+    "Reply by ١٢/٢٥ please.",
+])
+def test_deadline_patterns_accept_non_ascii_digits(text):
+    """
+    Test that deadlines written with non-ASCII digits are still found.
+    """
+    assert find_deadlines(text) == [text]
+    assert analyze(text)["deadlines"] == [text]
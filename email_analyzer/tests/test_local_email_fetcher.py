@@ -1,28 +1,21 @@
 import unittest
-from unittest.mock import MagicMock, patch
-import sys
-import logging
+from unittest.mock import MagicMock, PropertyMock, patch
 import datetime
-import io
-
-# Mock win32com.client before importing the module under test
-sys.modules["win32com"] = MagicMock()
-sys.modules["win32com.client"] = MagicMock()
+import time
 
+# win32com is mocked in conftest.py before the module under test is imported
 from src.local_email_fetcher import LocalEmailFetcher, OL_MAIL_ITEM
 
-class TestLocalEmailFetcherSecurity(unittest.TestCase):
-    def setUp(self):
-        # Setup logging capture
-        self.logger = logging.getLogger("src.local_email_fetcher")
-        self.log_capture_string = io.StringIO()
-        self.ch = logging.StreamHandler(self.log_capture_string)
-        self.ch.setLevel(logging.ERROR)
-        self.logger.addHandler(self.ch)
+# Received time for items whose date doesn't matter to the test
+_FIXED_TIME = datetime.datetime(2024, 1, 1, 12, 0, 0)
 
-    def tearDown(self):
-        self.logger.removeHandler(self.ch)
+class _FailingBodyMock(MagicMock):
+    """Mail item mock whose Body cannot be read."""
+    @property
+    def Body(self):
+        raise Exception("Simulated Body Access Error")
 
+class TestLocalEmailFetcherSecurity(unittest.TestCase):
     @patch("src.local_email_fetcher.win32com.client")
     def test_sensitive_data_logging(self, mock_win32):
         """
@@ -33,35 +26,34 @@ class TestLocalEmailFetcherSecurity(unittest.TestCase):
         mock_namespace = MagicMock()
         mock_folder = MagicMock()
 
-        mock_win32.GetActiveObject.return_value = mock_outlook
+        mock_win32.gencache.EnsureDispatch.return_value = mock_outlook
         mock_outlook.GetNamespace.return_value = mock_namespace
         mock_namespace.GetDefaultFolder.return_value = mock_folder
 
         # Create a mock mail item that fails when Body is accessed
-        mock_item = MagicMock()
+        mock_item = _FailingBodyMock()
         mock_item.Class = OL_MAIL_ITEM
         mock_item.Subject = "Confidential Project Takeover"
+        mock_item.SenderName = "Sender"
         mock_item.EntryID = "00000000ABCDEF1234567890" # Mock EntryID
-        mock_item.ReceivedTime = datetime.datetime.now()
-
-        # Configure Body access to raise an exception
-        # We need to set the side effect on the property access
-        type(mock_item).Body = unittest.mock.PropertyMock(side_effect=Exception("Simulated Body Access Error"))
+        mock_item.ReceivedTime = _FIXED_TIME
 
         # Setup folder items
         mock_items = MagicMock()
         mock_items.Restrict.return_value = mock_items # Mock Restrict returning self or another mock
-        mock_items.__iter__.return_value = iter([mock_item])
+        mock_items.GetFirst.return_value = mock_item
+        mock_items.GetNext.return_value = None
         mock_folder.Items = mock_items
         mock_folder.Folders = [] # No subfolders
 
         fetcher = LocalEmailFetcher()
 
-        # Run fetch_emails
-        fetcher.fetch_emails(folder_name="Inbox")
+        # Run fetch_emails, capturing the error logs
+        with self.assertLogs("src.local_email_fetcher", level="ERROR") as cm:
+            fetcher.fetch_emails(folder_name="Inbox")
 
         # Check logs
-        log_contents = self.log_capture_string.getvalue()
+        log_contents = "\n".join(cm.output)
 
         # 1. Verify that the SENSITIVE subject is NOT in the logs
         self.assertNotIn("Confidential Project Takeover", log_contents, "Security Fix Failed: Subject was logged!")
@@ -70,5 +62,149 @@ class TestLocalEmailFetcherSecurity(unittest.TestCase):
         self.assertIn("EntryID: 00000000ABCDEF123456...", log_contents, "Expected EntryID to be logged")
         self.assertIn("Simulated Body Access Error", log_contents, "Expected the exception message to be logged")
 
-if __name__ == "__main__":
-    unittest.main()
+def _make_folder(name, subjects, subfolders=(), old_subjects=()):
+    """
+    Builds a mock Outlook folder holding one mail item per subject, received now,
+    followed by one per old subject, received a month ago.
+    """
+    folder = MagicMock()
+    folder.Name = name
+    folder.EntryID = f"{name}-entry"
+    folder.StoreID = "store"
+    mail_items = []
+    now = datetime.datetime.now()
+    month_ago = now - datetime.timedelta(days=30)
+    for subject in list(subjects) + list(old_subjects):
+        item = MagicMock()
+        item.Class = OL_MAIL_ITEM
+        item.Subject = subject
+        item.SenderName = "Sender"
+        item.Body = f"Body of {subject}"
+        item.ReceivedTime = month_ago if subject in old_subjects else now
+        mail_items.append(item)
+    items = MagicMock()
+    items.Restrict.return_value = items
+    def _get_first():
+        items.remaining = iter(mail_items)
+        return next(items.remaining, None)
+    items.GetFirst.side_effect = _get_first
+    items.GetNext.side_effect = lambda: next(items.remaining, None)
+    folder.Items = items
+    folder.Folders.Count = len(subfolders)
+    folder.Folders.Item.side_effect = lambda index: subfolders[index - 1]
+    return folder
+
+class TestLocalEmailFetcherRecursive(unittest.TestCase):
+    @patch("src.local_email_fetcher.MAX_FOLDER_WORKERS", 2)
+    @patch("src.local_email_fetcher.pythoncom")
+    @patch("src.local_email_fetcher.win32com.client")
+    def test_recursive_fetch_reads_subfolders_in_order(self, mock_win32, mock_pythoncom):
+        """
+        Test that subfolders read on worker threads are re-opened by ID and
+        yielded in depth-first order after the parent folder.
+        """
+        grandchild = _make_folder("Grandchild", ["Third"])
+        child_a = _make_folder("ChildA", ["Second"], [grandchild])
+        child_b = _make_folder("ChildB", ["Fourth"])
+        root = _make_folder("Inbox", ["First"], [child_a, child_b])
+        folders_by_id = {f.EntryID: f for f in (grandchild, child_a, child_b)}
+
+        mock_namespace = MagicMock()
+        mock_win32.gencache.EnsureDispatch.return_value.GetNamespace.return_value = mock_namespace
+        mock_namespace.GetDefaultFolder.return_value = root
+        mock_namespace.GetFolderFromID.side_effect = lambda entry_id, store_id: folders_by_id[entry_id]
+
+        fetcher = LocalEmailFetcher()
+        emails = fetcher.fetch_emails(folder_name="Inbox", recursive=True)
+
+        self.assertEqual([e["subject"] for e in emails], ["First", "Second", "Third", "Fourth"])
+        self.assertEqual(mock_namespace.GetFolderFromID.call_count, 3)
+        # Each of the two workers connects once and leaves the COM apartment it joined
+        self.assertEqual(mock_win32.gencache.EnsureDispatch.call_count, 1 + 2)
+        self.assertEqual(mock_pythoncom.CoInitialize.call_count, 2)
+        self.assertEqual(mock_pythoncom.CoUninitialize.call_count, 2)
+
+    @patch("src.local_email_fetcher.MAX_FOLDER_WORKERS", 1)
+    @patch("src.local_email_fetcher.win32com.client")
+    def test_recursive_fetch_reads_subfolders_on_demand(self, mock_win32):
+        """
+        Test that subfolders are only read a worker's worth ahead of the consumer,
+        and that no more are read once the consumer stops.
+        """
+        children = [_make_folder(f"Child{i}", [f"Email {i}"]) for i in range(5)]
+        root = _make_folder("Inbox", ["First"], children)
+        folders_by_id = {f.EntryID: f for f in children}
+
+        mock_namespace = MagicMock()
+        mock_win32.gencache.EnsureDispatch.return_value.GetNamespace.return_value = mock_namespace
+        mock_namespace.GetDefaultFolder.return_value = root
+        mock_namespace.GetFolderFromID.side_effect = lambda entry_id, store_id: folders_by_id[entry_id]
+
+        fetcher = LocalEmailFetcher()
+        emails = fetcher.iter_emails(folder_name="Inbox", recursive=True)
+        self.assertEqual([next(emails)["subject"], next(emails)["subject"]], ["First", "Email 0"])
+        # Give the worker time to run ahead, if it could
+        time.sleep(0.05)
+        emails.close()
+
+        # The first child, plus only the one submitted to replace it
+        self.assertLessEqual(mock_namespace.GetFolderFromID.call_count, 2)
+
+    @patch("src.local_email_fetcher.win32com.client")
+    def test_recursive_fetch_skips_unreadable_subfolder(self, mock_win32):
+        """
+        Test that a subfolder which cannot be read does not hide its siblings.
+        """
+        broken = _make_folder("Broken", ["Hidden"])
+        child = _make_folder("Child", ["Second"])
+        root = _make_folder("Inbox", ["First"], [broken, child])
+
+        mock_namespace = MagicMock()
+        mock_win32.gencache.EnsureDispatch.return_value.GetNamespace.return_value = mock_namespace
+        mock_namespace.GetDefaultFolder.return_value = root
+        mock_namespace.GetFolderFromID.side_effect = lambda entry_id, store_id: child
+
+        fetcher = LocalEmailFetcher()
+        with patch.object(type(broken), "EntryID", create=True, new_callable=PropertyMock,
+                          side_effect=Exception("Simulated Folder Error")), \
+             self.assertLogs("src.local_email_fetcher", level="WARNING"):
+            emails = fetcher.fetch_emails(folder_name="Inbox", recursive=True)
+
+        self.assertEqual([e["subject"] for e in emails], ["First", "Second"])
+
+class TestLocalEmailFetcherDateFilter(unittest.TestCase):
+    @patch("src.local_email_fetcher.win32com.client")
+    def test_manual_date_filter_when_restrict_fails(self, mock_win32):
+        """
+        Test that old items are still dropped when Restrict cannot be applied.
+        """
+        folder = _make_folder("Inbox", ["Recent"], old_subjects=["Old"])
+        folder.Items.Restrict.side_effect = Exception("Simulated Restrict Error")
+        mock_namespace = MagicMock()
+        mock_win32.gencache.EnsureDispatch.return_value.GetNamespace.return_value = mock_namespace
+        mock_namespace.GetDefaultFolder.return_value = folder
+
+        fetcher = LocalEmailFetcher()
+        with self.assertLogs("src.local_email_fetcher", level="WARNING"):
+            emails = fetcher.fetch_emails(folder_name="Inbox")
+
+        self.assertEqual([e["subject"] for e in emails], ["Recent"])
+
+class TestLocalEmailFetcherFindFolder(unittest.TestCase):
+    @patch("src.local_email_fetcher.win32com.client")
+    def test_find_folder_by_path(self, mock_win32):
+        """
+        Test that path parts resolve by name lookup, falling back to a
+        case-insensitive scan when the exact name is not found.
+        """
+        year = _make_folder("2023", [])
+        archive = _make_folder("Archive", [], [year])
+        archive.Folders.Item.side_effect = lambda key: {1: year, "2023": year}[key]
+        root = _make_folder("Mailbox", [], [archive])
+        root.Folders.Item.side_effect = lambda key: {1: archive, "Archive": archive}[key]
+
+        fetcher = LocalEmailFetcher()
+
+        self.assertIs(fetcher._find_folder(root, "Archive/2023"), year)
+        self.assertIs(fetcher._find_folder(root, "archive\\2023"), year)
+        self.assertIsNone(fetcher._find_folder(root, "Archive/2024"))
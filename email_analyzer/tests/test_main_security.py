@@ -1,29 +1,45 @@
 import unittest
 from unittest.mock import MagicMock, patch
-import sys
+from functools import lru_cache
 import logging
+import time
 
-# Mock tkinter before importing main
-sys.modules["tkinter"] = MagicMock()
-sys.modules["tkinter.ttk"] = MagicMock()
-sys.modules["tkinter.messagebox"] = MagicMock()
-sys.modules["tkinter.scrolledtext"] = MagicMock()
+# tkinter and pywin32 are mocked in conftest.py before main is imported
 
-# Mock win32com just in case local_email_fetcher is imported and tries to use it
-sys.modules["win32com"] = MagicMock()
-sys.modules["win32com.client"] = MagicMock()
+# main.py does sys.path.insert for src, so importing it is enough.
+# Run with pytest (from the repository root or email_analyzer/) so conftest.py applies.
 
-# We need to ensure src is in path if main imports it?
-# main.py does sys.path.insert, so it should handle it.
-# But we are in email_analyzer/tests/ ..
-# If we run from email_analyzer/ directory, main is in ., src is in ./src
-# We will run `python3 -m unittest tests/test_main_security.py` from email_analyzer/
+# Truncation does not depend on the limit's size, so tests use a small one
+TEST_MAX_BODY_LENGTH = 1024
 
-import main
-from main import EmailAnalyzerGUI, MAX_BODY_LENGTH
+@lru_cache(maxsize=None)
+def _main():
+    """Imports main on first use, so collecting (or deselecting) these tests doesn't."""
+    import main
+    return main
 
 class TestEmailAnalyzerSecurity(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.main = _main()
+        # Built once for the class rather than in every test
+        cls.huge_body = "A" * (TEST_MAX_BODY_LENGTH + 500)
+
+    def _make_app(self):
+        """Creates the GUI on a mocked root, with the UI variables run_analysis reads."""
+        root = MagicMock()
+        app = self.main.EmailAnalyzerGUI(root)
+
+        # Setup UI variables that are accessed in run_analysis
+        app.folder_var = MagicMock()
+        app.folder_var.get.return_value = "Inbox"
+        app.recursive_var = MagicMock()
+        app.recursive_var.get.return_value = False
+        app.date_range_var = MagicMock()
+        app.date_range_var.get.return_value = 0
+        return app
 
+    @patch("main.MAX_BODY_LENGTH", TEST_MAX_BODY_LENGTH)
     @patch("main.split_sentences")
     @patch("main.LocalEmailFetcher")
     def test_dos_prevention_large_body(self, mock_fetcher_cls, mock_split):
@@ -33,10 +49,10 @@ class TestEmailAnalyzerSecurity(unittest.TestCase):
         # Setup mock fetcher
         mock_fetcher_instance = mock_fetcher_cls.return_value
 
-        # Create a huge body
-        huge_body = "A" * (MAX_BODY_LENGTH + 5000)
+        max_length = self.main.MAX_BODY_LENGTH
+        huge_body = self.huge_body
 
-        mock_fetcher_instance.fetch_emails.return_value = [
+        emails = [
             {
                 "subject": "Huge Email",
                 "body": huge_body,
@@ -44,26 +60,16 @@ class TestEmailAnalyzerSecurity(unittest.TestCase):
                 "received_time": "2023-01-01"
             }
         ]
+        # A fresh iterator per call, like the real generator
+        mock_fetcher_instance.iter_emails.side_effect = lambda *args, **kwargs: iter(emails)
 
         # Mock split_sentences to just return empty list (we only care about input)
         mock_split.return_value = []
 
-        # Initialize GUI (mocked)
-        root = MagicMock()
-        app = EmailAnalyzerGUI(root)
-
-        # Setup UI variables that are accessed in run_analysis
-        app.folder_var = MagicMock()
-        app.folder_var.get.return_value = "Inbox"
-        app.recursive_var = MagicMock()
-        app.recursive_var.get.return_value = False
-        app.date_range_var = MagicMock()
-        app.date_range_var.get.return_value = 0
+        app = self._make_app()
 
         # Mock the analyzer functions, prevent side effects, and capture logs
-        with patch("main.find_todos", return_value=[]), \
-             patch("main.find_deadlines", return_value=[]), \
-             patch("main.find_name_mentions", return_value=[]), \
+        with patch("main.analyze", return_value={"todos": [], "deadlines": [], "mentions": []}), \
              self.assertLogs(level='WARNING') as cm:
 
             # Run analysis directly
@@ -71,7 +77,7 @@ class TestEmailAnalyzerSecurity(unittest.TestCase):
 
             # Verify that a warning was logged for truncation
             self.assertEqual(len(cm.output), 1)
-            expected_log = f"Email 'Huge Email...' body too large ({len(huge_body)} chars). Truncating to {MAX_BODY_LENGTH}."
+            expected_log = f"Email 'Huge Email...' body too large ({len(huge_body)} chars). Truncating to {max_length}."
             self.assertIn(expected_log, cm.output[0])
 
         # Verify split_sentences was called with truncated body
@@ -79,8 +85,60 @@ class TestEmailAnalyzerSecurity(unittest.TestCase):
         args, _ = mock_split.call_args
         called_body = args[0]
 
-        self.assertEqual(len(called_body), MAX_BODY_LENGTH)
-        self.assertEqual(called_body, huge_body[:MAX_BODY_LENGTH])
+        self.assertEqual(len(called_body), max_length)
+        # The body is all "A"s, so with the length check this pins the exact prefix
+        # without slicing a second copy of it
+        self.assertEqual(called_body.count("A"), max_length)
 
-if __name__ == "__main__":
-    unittest.main()
+    @patch("main.split_sentences", return_value=[])
+    @patch("main.LocalEmailFetcher")
+    def test_long_bodies_are_not_cached(self, mock_fetcher_cls, mock_split):
+        """
+        Test that only short bodies are kept in the analysis cache, and that the
+        cache is emptied once a run finishes.
+        """
+        cache_info = self.main._analyze_cached_body.cache_info
+        self.main._analyze_cached_body.cache_clear()
+        long_body = "A" * (self.main.MAX_CACHED_BODY_LENGTH + 1)
+
+        self.main._analyze_email("Long", long_body, None)
+        self.assertEqual(cache_info().currsize, 0)
+        self.main._analyze_email("Short", "A" * 10, None)
+        self.assertEqual(cache_info().currsize, 1)
+
+        emails = [{"subject": "Short", "body": "A" * 10}]
+        mock_fetcher_cls.return_value.iter_emails.side_effect = lambda *args, **kwargs: iter(emails)
+        self._make_app().run_analysis("Test User")
+        self.assertEqual(cache_info().currsize, 0)
+
+    @patch("main.ANALYSIS_BATCH_SIZE", 2)
+    @patch("main.MAX_PENDING_BATCHES_PER_WORKER", 2)
+    @patch("main.os.cpu_count", return_value=1)
+    @patch("main.LocalEmailFetcher")
+    def test_fetch_stays_bounded_ahead_of_analysis(self, mock_fetcher_cls, mock_cpu_count):
+        """
+        Test that emails are only fetched a bounded number of batches ahead of the
+        analysis, so a large mailbox is never held in memory at once.
+        """
+        email_count = 20
+        max_in_flight = self.main.ANALYSIS_BATCH_SIZE * self.main.MAX_PENDING_BATCHES_PER_WORKER
+        analyzed = []
+        fetched_ahead = []
+
+        def iter_emails(*args, **kwargs):
+            for i in range(email_count):
+                fetched_ahead.append(i - len(analyzed))
+                yield {"subject": f"Email {i}", "body": ""}
+
+        def slow_analyze_batch(subjects, bodies, name_pattern):
+            # Slower than fetching, so an unbounded fetch would run far ahead
+            time.sleep(0.005)
+            analyzed.extend(subjects)
+            return [((), (), ()) for _ in subjects]
+
+        mock_fetcher_cls.return_value.iter_emails.side_effect = iter_emails
+        with patch("main._analyze_batch", side_effect=slow_analyze_batch):
+            self._make_app().run_analysis("Test User")
+
+        self.assertEqual(len(analyzed), email_count)
+        self.assertLess(max(fetched_ahead), max_in_flight)